@@ -0,0 +1,64 @@
+"""Compare the Core read path with ORM loading for a full product listing.
+
+Run from the repository root:
+
+    python bench/read_path.py [--rows 20000]
+
+Both paths read every product from an in-memory SQLite database and dump it
+with ProductSchema. The Core path is the one the read endpoints use: plain
+rows of serialized_columns() fed to the compiled serializer. Each path is
+timed and its peak allocation measured with tracemalloc.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, select  # noqa: E402
+
+from app import (  # noqa: E402
+    Product, ProductSchema, TestingConfig, compiled_schema, create_app, db, products_schema, serialized_columns,
+)
+
+
+def orm_read():
+    return products_schema.dump(Product.query.all())
+
+
+def core_read():
+    schema, dump = compiled_schema(ProductSchema, many=True)
+    return dump(db.session.execute(select(*serialized_columns(Product, schema))).all())
+
+
+def measure(read):
+    db.session.remove()
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = read()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return len(rows), elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000, help="Products to read (default 20000).")
+    args = parser.parse_args()
+
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.session.execute(insert(Product.__table__), [
+            {'name': f'Product {index}', 'price': 1.5, 'quantity': 3} for index in range(args.rows)
+        ])
+        db.session.commit()
+        for label, read in (('Model.query.all() + dump', orm_read), ('Core rows + compiled dump', core_read)):
+            count, elapsed, peak = measure(read)
+            print(f"{label:<28} {count} rows  {elapsed:.2f} s  peak {peak / 1e6:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
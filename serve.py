@@ -0,0 +1,89 @@
+"""Pre-forking production server for the E-Commerce API.
+
+The parent process builds the app and binds the listening socket once, then
+forks worker processes that all accept connections on that socket:
+
+    python serve.py --bind 0.0.0.0:8000 --workers 4
+
+Needs os.fork, so it runs on Linux/macOS only.
+"""
+import argparse
+import gc
+import os
+import signal
+import sys
+
+from werkzeug.serving import make_server
+
+from app import create_app, db
+
+
+def run_worker(app, server):
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    # Pooled connections opened in the parent (e.g. by AUTO_CREATE_SCHEMA) must not
+    # be shared across processes. close=False leaves the parent's sockets alone.
+    with app.app_context():
+        db.engine.dispose(close=False)
+    try:
+        server.serve_forever()
+    finally:
+        os._exit(0)
+
+
+def spawn_worker(app, server):
+    pid = os.fork()
+    if pid == 0:
+        run_worker(app, server)
+    return pid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the E-Commerce API with pre-forked workers.")
+    parser.add_argument('--bind', default=os.environ.get('BIND', '0.0.0.0:8000'), help="host:port to listen on")
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1)),
+        help="number of worker processes (default: WEB_CONCURRENCY or the CPU count)",
+    )
+    args = parser.parse_args(argv)
+    if not hasattr(os, 'fork'):
+        sys.exit("serve.py needs os.fork; use `python app.py` on this platform.")
+    host, _, port = args.bind.rpartition(':')
+
+    app = create_app()
+    app.debug = False
+    server = make_server(host, int(port), app)
+
+    # Everything allocated so far is shared with the workers. Freezing it keeps the
+    # garbage collector from writing to those pages and so copying them per worker.
+    gc.collect()
+    gc.freeze()
+
+    workers = {spawn_worker(app, server) for _ in range(args.workers)}
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in workers:
+            os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    print(f"Serving on http://{host}:{server.port} with {args.workers} workers", file=sys.stderr)
+
+    while workers:
+        try:
+            pid, _ = os.wait()
+        except ChildProcessError:
+            break
+        workers.discard(pid)
+        if not stopping:
+            workers.add(spawn_worker(app, server))
+    server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+import pytest
+from sqlalchemy import event
+
+from app import TestingConfig, create_app, db
+
+
+class QueryCounter:
+    """Counts the SQL statements executed; reset ``count`` between measurements."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+@pytest.fixture
+def app():
+    app = create_app(TestingConfig)
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def queries(app):
+    counter = QueryCounter()
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', counter)
+    return counter
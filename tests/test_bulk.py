@@ -0,0 +1,41 @@
+import pytest
+
+import app as app_module
+from app import db
+
+
+@pytest.fixture
+def users(client):
+    client.post('/users/bulk', json=[{'name': name, 'email': f'{name}@example.com', 'phone': '555'} for name in 'ab'])
+
+
+def test_rows_that_break_constraints_are_reported_by_index(client, users):
+    client.post('/accounts/bulk', json=[{'username': 'taken', 'password': 'x', 'user_id': 1}])
+    response = client.post('/accounts/bulk', json=[
+        {'username': 'taken', 'password': 'x', 'user_id': 1},
+        {'username': 'new', 'password': 'x', 'user_id': 2},
+        {'username': 'other', 'password': 'x', 'user_id': 99},
+        {'username': 'new', 'password': 'x', 'user_id': 1},
+        {'username': 'nameless', 'user_id': 1},
+        {'username': 'last', 'password': 'x'},
+    ])
+    assert response.status_code == 201
+    assert response.json['inserted_ids'] == [2, 3]
+    assert response.json['errors'] == {
+        '0': {'username': ['Already exists.']},
+        '2': {'user_id': ['No users row with id 99.']},
+        '3': {'username': ['Repeats an earlier row of this request.']},
+        '4': {'password': ['Missing data for required field.']},
+    }
+
+
+def test_ids_without_returning_or_consecutive_ids(app, client, monkeypatch):
+    # As on MySQL with innodb_autoinc_lock_mode=2. (SQLite's lastrowid is the last
+    # id of a multi-row INSERT, not the first, so the consecutive path is MySQL only.)
+    app.config['BULK_CHUNK_SIZE'] = 2
+    with app.app_context():
+        monkeypatch.setattr(db.engine.dialect, 'insert_executemany_returning', False)
+    monkeypatch.setattr(app_module, 'consecutive_insert_ids', lambda: False)
+    response = client.post('/products/bulk', json=[{'name': f'p{index}', 'price': 1, 'quantity': 1} for index in range(5)])
+    assert response.json['inserted_ids'] == [1, 2, 3, 4, 5]
+    assert [product['name'] for product in client.get('/products').json['items']] == [f'p{index}' for index in range(5)]
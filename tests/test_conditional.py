@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import event
+
+from app import db
+
+
+@pytest.fixture
+def catalog(client):
+    client.post('/users', json={'name': 'Ada', 'email': 'ada@example.com', 'phone': '555'})
+    client.post('/products/bulk', json=[{'name': f'p{index}', 'price': 2, 'quantity': 50} for index in range(6)])
+    for product_id in (1, 2):
+        client.post('/new-order', json={
+            'date': '2024-12-18T10:30:00.000Z', 'user_id': 1, 'items': [{'product_id': product_id, 'quantity': 1}],
+        })
+
+
+def revalidate(client, url):
+    return client.get(url, headers={'If-None-Match': client.get(url).headers['ETag']})
+
+
+@pytest.mark.parametrize('url', ['/products?limit=2', '/products?sort=-price&limit=2', '/products?ids=1,2',
+                                 '/orders?limit=1', '/orders?ids=1'])
+def test_page_validators_do_not_scan_whole_tables(app, client, catalog, url):
+    statements = []
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', lambda conn, cursor, sql, *args: statements.append(sql))
+    assert revalidate(client, url).status_code == 304
+    assert not [sql for sql in statements if 'count(' in sql.lower()]
+
+
+@pytest.mark.parametrize('url, change, modified', [
+    ('/products?limit=2', lambda client: client.patch('/products/2', json={'price': 3}), True),
+    ('/products?limit=2', lambda client: client.patch('/products/5', json={'price': 3}), False),
+    ('/products?limit=2', lambda client: client.delete('/products/2'), True),
+    ('/products?ids=3,4', lambda client: client.patch('/stock/4', json={'delta': 1}), True),
+    ('/orders?limit=1', lambda client: client.patch('/products/1', json={'name': 'renamed'}), True),
+    ('/orders?limit=1', lambda client: client.patch('/products/2', json={'name': 'renamed'}), False),
+    ('/orders?ids=1', lambda client: client.delete('/orders/1'), True),
+])
+def test_page_etags_follow_the_rows_on_the_page(client, catalog, url, change, modified):
+    etag = client.get(url).headers['ETag']
+    change(client)
+    response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == (200 if modified else 304)
+
+
+@pytest.mark.parametrize('url', ['/products?limit=2', '/products?ids=1,2', '/stock?ids=1,2', '/orders?limit=1',
+                                 '/products?stream=json'])
+def test_collections_are_validated_by_etag_alone(client, catalog, url):
+    response = client.get(url)
+    assert 'Last-Modified' not in response.headers
+    since = {'If-Modified-Since': 'Fri, 01 Jan 2100 00:00:00 GMT'}
+    client.delete('/products/2')
+    assert client.get(url, headers=since).status_code == 200
+
+
+def test_single_resources_honor_if_modified_since(client, catalog):
+    last_modified = client.get('/products/1').headers['Last-Modified']
+    assert client.get('/products/1', headers={'If-Modified-Since': last_modified}).status_code == 304
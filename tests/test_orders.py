@@ -0,0 +1,92 @@
+import pytest
+from sqlalchemy import event
+
+from app import Order, OrderProduct, Product, User, db
+
+
+def add_orders(app, count):
+    """Add ``count`` orders of user 1 with two lines each, one on a product that every order shares."""
+    with app.app_context():
+        if db.session.get(User, 1) is None:
+            db.session.add(User(id=1, name='Ada', email='ada@example.com', phone='555'))
+            db.session.add(Product(id=1, name='shared', price=1.5, quantity=1000))
+        for _ in range(count):
+            product = Product(name='item', price=2.0, quantity=10)
+            order = Order(user_id=1, total_price=3.5)
+            db.session.add_all([product, order])
+            db.session.flush()
+            db.session.add_all([
+                OrderProduct(order_id=order.id, product_id=1, quantity=1),
+                OrderProduct(order_id=order.id, product_id=product.id, quantity=1),
+            ])
+        db.session.commit()
+
+
+@pytest.mark.parametrize('url', [
+    '/orders?limit=500',
+    '/orders?stream=json',
+    '/orders?ids=1,2,3',
+    '/orders/1',
+    '/user/1/orders?limit=500',
+])
+def test_order_reads_run_a_fixed_number_of_queries(app, client, queries, url):
+    counts = []
+    for count in (2, 20):
+        add_orders(app, count)
+        queries.count = 0
+        response = client.get(url)
+        response.get_data()
+        assert response.status_code == 200
+        counts.append(queries.count)
+    assert counts[0] == counts[1]
+
+
+def test_order_listing_includes_every_line(app, client):
+    add_orders(app, 3)
+    items = client.get('/orders').json['items']
+    assert [order['id'] for order in items] == [1, 2, 3]
+    for order in items:
+        assert sorted(line['product']['id'] for line in order['order_products']) == [1, order['id'] + 1]
+        assert {line['product']['name'] for line in order['order_products']} == {'shared', 'item'}
+
+
+def test_deleting_a_user_changes_the_etags_of_their_orders(app, client):
+    add_orders(app, 1)
+    order = client.get('/orders/1')
+    listing = client.get('/orders')
+    assert client.delete('/user/1').status_code == 200
+    response = client.get('/orders/1', headers={'If-None-Match': order.headers['ETag']})
+    assert response.status_code == 200
+    assert response.json['user_id'] is None
+    assert client.get('/orders', headers={'If-None-Match': listing.headers['ETag']}).status_code == 200
+    assert client.delete('/user/1').status_code == 404
+
+
+def test_export_pages_through_lines_without_skipping_any(app, client):
+    add_orders(app, 10)
+    app.config['STREAM_BATCH_SIZE'] = 3
+    lines = client.get('/orders/export?format=csv').data.decode().splitlines()
+    assert lines[0].startswith('order_id,')
+    keys = [tuple(map(int, line.split(',')[0:5:4])) for line in lines[1:]]
+    assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys) == 20
+
+
+@pytest.mark.parametrize('mode', ['lock', 'atomic'])
+@pytest.mark.parametrize('order, status', [
+    ({'user_id': 2, 'items': [{'product_id': 1, 'quantity': 1}]}, 404),
+    ({'user_id': 1, 'items': [{'product_id': 1, 'quantity': 1}, {'product_id': 99, 'quantity': 1}]}, 404),
+    ({'user_id': 1, 'items': [{'product_id': 1, 'quantity': 1}, {'product_id': 2, 'quantity': 6}]}, 400),
+])
+def test_rejected_orders_cost_one_read_and_no_writes(app, client, mode, order, status):
+    app.config['ORDER_STOCK_MODE'] = mode
+    client.post('/users', json={'name': 'Ada', 'email': 'ada@example.com', 'phone': '555'})
+    client.post('/products/bulk', json=[{'name': 'Laptop', 'price': 999.99, 'quantity': 5},
+                                        {'name': 'Mouse', 'price': 20, 'quantity': 5}])
+    client.get('/products?ids=1,2')
+    statements = []
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', lambda conn, cursor, sql, *args: statements.append(sql))
+    response = client.post('/new-order', json={'date': '2024-12-18T10:30:00.000Z', **order})
+    assert response.status_code == status
+    assert len(statements) == 1 and statements[0].startswith('SELECT')
@@ -0,0 +1,52 @@
+import pytest
+
+from app import CustomerAccount, User, db
+
+
+@pytest.fixture
+def records(app, client):
+    client.post('/products', json={'name': 'Laptop', 'price': 999.99, 'quantity': 10})
+    with app.app_context():
+        db.session.add(User(name='Ada', email='ada@example.com', phone='555'))
+        db.session.add_all([CustomerAccount(username='ada', password='one', user_id=1),
+                            CustomerAccount(username='ada2', password='two', user_id=1)])
+        db.session.commit()
+
+
+@pytest.mark.parametrize('url, body, check', [
+    ('/products/1', {'price': 899.99}, '/products/1'),
+    ('/user/1', {'email': 'ada@example.org'}, '/user/1'),
+])
+def test_patch_changes_only_the_given_fields(client, records, url, body, check):
+    before = client.get(check).json
+    assert client.patch(url, json=body).status_code == 200
+    assert client.get(check).json == {**before, **body}
+
+
+@pytest.mark.parametrize('url, body', [
+    ('/products/1', {'id': 42}),
+    ('/user/1', {'id': 7}),
+    ('/accounts/1', {'user_id': 3}),
+])
+def test_patch_cannot_change_keys(client, records, url, body):
+    response = client.patch(url, json=body)
+    assert response.status_code == 400
+    assert list(response.json) == list(body)
+    assert client.get('/products/1').status_code == 200
+    assert client.get('/user/1').status_code == 200
+
+
+@pytest.mark.parametrize('url', ['/products/9', '/user/9', '/accounts/9'])
+def test_patch_of_a_missing_row_is_404(client, records, url):
+    assert client.patch(url, json={'password': 'x'} if 'accounts' in url else {'name': 'x'}).status_code == 404
+
+
+def test_patch_of_an_empty_body_is_400(client, records):
+    assert client.patch('/products/1', json={}).status_code == 400
+
+
+def test_account_patch_changes_only_the_first_account_like_put(app, client, records):
+    assert client.patch('/accounts/1', json={'password': 'three'}).status_code == 200
+    with app.app_context():
+        accounts = CustomerAccount.query.order_by(CustomerAccount.id).all()
+        assert [account.password for account in accounts] == ['three', 'two']
@@ -0,0 +1,123 @@
+import json
+
+import pytest
+from sqlalchemy import event, select
+
+from app import Product, TestingConfig, create_app, db, encode_cursor, filter_products
+
+
+def query_plan(connection, statement, parameters=()):
+    return ' '.join(row[3] for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters))
+
+
+@pytest.fixture
+def products(client):
+    client.post('/products/bulk', json=[
+        {'name': f'Product {index:03}', 'price': index % 50, 'quantity': index % 3} for index in range(200)
+    ])
+
+
+@pytest.mark.parametrize('query, index', [
+    ('min_price=10', 'ix_products_price'),
+    ('max_price=10', 'ix_products_price'),
+    ('in_stock=true', 'ix_products_quantity'),
+    ('in_stock=false', 'ix_products_quantity'),
+    ('name_prefix=Product%2001', 'ix_products_name'),
+])
+def test_filters_are_index_searches(app, query, index):
+    with app.test_request_context(f'/products?{query}'):
+        stmt, _, _ = filter_products(select(Product.id))
+        connection = db.session.connection()
+        # SQLite's LIKE ignores case unless told otherwise, and only a LIKE whose case
+        # rules match the index's collation can use it (as on MySQL).
+        connection.exec_driver_sql('PRAGMA case_sensitive_like=ON')
+        sql = str(stmt.compile(dialect=connection.dialect, compile_kwargs={'literal_binds': True}))
+        assert f'SEARCH products USING COVERING INDEX {index}' in query_plan(connection, sql)
+
+
+@pytest.mark.parametrize('query, plan', [
+    ('sort=price', 'SCAN products USING INDEX ix_products_price'),
+    ('sort=-price', 'SCAN products USING INDEX ix_products_price'),
+    ('sort=name', 'SCAN products USING INDEX ix_products_name'),
+    ('sort=-name', 'SCAN products USING INDEX ix_products_name'),
+    ('sort=price&min_price=10', 'SEARCH products USING INDEX ix_products_price (price>?)'),
+    (f'sort=price&after={encode_cursor(10.0, 60)}', 'SEARCH products USING INDEX ix_products_price (price>?)'),
+    (f'sort=-price&after={encode_cursor(10.0, 60)}', 'SEARCH products USING INDEX ix_products_price (price<?)'),
+])
+def test_sorted_pages_read_the_index_in_order(app, client, products, query, plan):
+    statements = []
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', lambda conn, cursor, sql, params, *args: statements.append((sql, params)))
+    response = client.get(f'/products?limit=10&{query}')
+    assert response.status_code == 200
+    sql, parameters = next((sql, params) for sql, params in statements if 'ORDER BY' in sql)
+    with app.app_context():
+        actual = query_plan(db.session.connection(), sql, parameters)
+    assert plan in actual
+    assert 'TEMP B-TREE' not in actual
+
+
+def test_sorted_pages_walk_the_whole_catalog(client, products):
+    seen, after = [], None
+    while True:
+        page = client.get('/products?sort=-price&limit=7' + (f'&after={after}' if after else '')).json
+        seen += [(product['price'], product['id']) for product in page['items']]
+        after = page['next_cursor']
+        if after is None:
+            break
+    assert seen == sorted(seen, key=lambda key: (-key[0], -key[1]))
+    assert len(seen) == 200
+
+
+@pytest.mark.parametrize('sort', ['', '&sort=-price'])
+def test_streams_read_in_keyset_batches(app, client, products, sort):
+    app.config['STREAM_BATCH_SIZE'] = 30
+    statements = []
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', lambda conn, cursor, sql, *args: statements.append(sql))
+    lines = client.get(f'/products?stream=ndjson{sort}').data.splitlines()
+    rows = [(product['price'], product['id']) for product in map(json.loads, lines)]
+    expected = sorted(rows, key=lambda key: (-key[0], -key[1])) if sort else sorted(rows, key=lambda key: key[1])
+    assert rows == expected and len(rows) == 200
+    assert sum('LIMIT' in sql for sql in statements) == 7
+
+
+def test_name_prefix_matches_wildcards_literally(client):
+    client.post('/products/bulk', json=[
+        {'name': name, 'price': 1, 'quantity': 1} for name in ('50% off', '50 cents', 'a_b', 'axb')
+    ])
+    assert [p['name'] for p in client.get('/products?name_prefix=50%25').json['items']] == ['50% off']
+    assert [p['name'] for p in client.get('/products?name_prefix=a_').json['items']] == ['a_b']
+
+
+def test_product_reads_show_stock_taken_by_a_checkout(client):
+    client.post('/users', json={'name': 'Ada', 'email': 'ada@example.com', 'phone': '555'})
+    client.post('/products/bulk', json=[{'name': 'Laptop', 'price': 999.99, 'quantity': 1},
+                                        {'name': 'Mouse', 'price': 20, 'quantity': 2}])
+    before = client.get('/products/1')
+    client.get('/products?ids=1,2')
+    response = client.post('/new-order', json={'date': '2024-12-18T10:30:00.000Z', 'user_id': 1, 'items': [
+        {'product_id': 1, 'quantity': 1}, {'product_id': 2, 'quantity': 2},
+    ]})
+    assert response.status_code == 201
+    assert client.get('/products/1', headers={'If-None-Match': before.headers['ETag']}).status_code == 200
+    assert client.get('/products/1').json['quantity'] == 0
+    assert [product['quantity'] for product in client.get('/products?ids=1,2').json['items']] == [0, 0]
+
+
+def test_product_cache_of_one_worker_sees_changes_made_by_another(tmp_path):
+    class FileConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "shop.db"}'
+
+    reader, writer = create_app(FileConfig).test_client(), create_app(FileConfig).test_client()
+    writer.post('/users', json={'name': 'Ada', 'email': 'ada@example.com', 'phone': '555'})
+    writer.post('/products', json={'name': 'Laptop', 'price': 999.99, 'quantity': 5})
+    assert reader.get('/products/1').json['price'] == 999.99
+    assert reader.get('/products?ids=1').json['items'][0]['price'] == 999.99
+    writer.patch('/products/1', json={'name': 'Laptop Pro', 'price': 1299.0})
+    assert reader.get('/products/1').json == {'id': 1, 'name': 'Laptop Pro', 'price': 1299.0, 'quantity': 5}
+    assert reader.get('/products?ids=1').json['items'][0]['price'] == 1299.0
+    writer.patch('/products/1', json={'price': 1499.0})
+    order = {'date': '2024-12-18T10:30:00.000Z', 'user_id': 1, 'items': [{'product_id': 1, 'quantity': 2}]}
+    assert reader.post('/new-order', json=order).status_code == 201
+    assert reader.get('/orders/1').json['total_price'] == 2998.0
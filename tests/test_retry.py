@@ -0,0 +1,144 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+import app as app_module
+from app import Product, TestingConfig, User, create_app, db
+
+ORDER = {'date': '2024-12-18T10:30:00.000Z', 'user_id': 1, 'items': [{'product_id': 1, 'quantity': 1}]}
+
+
+class Deadlock(Exception):
+    errno = 1213
+
+
+def locked():
+    return OperationalError('UPDATE products ...', {}, sqlite3.OperationalError('database is locked'))
+
+
+def seed(app):
+    with app.app_context():
+        db.session.add_all([User(id=1, name='Ada', email='ada@example.com', phone='555'),
+                            Product(id=1, name='Laptop', price=999.99, quantity=10)])
+        db.session.commit()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(app_module.time, 'sleep', sleeps.append)
+    return sleeps
+
+
+def failing_place_order(monkeypatch, failures, error=locked):
+    """Make the first ``failures`` calls to place_order raise ``error()``, then place orders normally."""
+    place_order = app_module.place_order
+    calls = []
+
+    def flaky(order_data):
+        calls.append(order_data)
+        if len(calls) <= failures:
+            raise error()
+        return place_order(order_data)
+
+    monkeypatch.setattr(app_module, 'place_order', flaky)
+    return calls
+
+
+def transaction_stats(client):
+    return client.get('/stats').json['transactions'].get('api.order_products', {'retries': 0, 'aborts': 0})
+
+
+def test_lock_conflicts_are_retried_until_the_order_succeeds(app, client, monkeypatch, sleeps):
+    seed(app)
+    calls = failing_place_order(monkeypatch, 2)
+    response = client.post('/new-order', json=ORDER)
+    assert response.status_code == 201
+    assert len(calls) == 3
+    assert transaction_stats(client) == {'retries': 2, 'aborts': 0}
+    # Full jitter below an exponentially growing cap.
+    assert len(sleeps) == 2
+    for attempt, delay in enumerate(sleeps):
+        assert 0 <= delay <= app.config['TX_RETRY_BASE_DELAY'] * 2 ** attempt
+    # Only the successful attempt left anything behind.
+    assert client.get('/orders').json['items'][0]['order_products'][0]['quantity'] == 1
+    assert client.get('/stock?ids=1').json['items'] == [{'id': 1, 'quantity': 9}]
+
+
+def test_mysql_deadlocks_are_retried(app, client, monkeypatch, sleeps):
+    seed(app)
+    failing_place_order(monkeypatch, 1, lambda: OperationalError('UPDATE ...', {}, Deadlock(1213, 'Deadlock found')))
+    assert client.post('/new-order', json=ORDER).status_code == 201
+    assert transaction_stats(client) == {'retries': 1, 'aborts': 0}
+
+
+def test_running_out_of_attempts_answers_503(app, client, monkeypatch, sleeps):
+    seed(app)
+    calls = failing_place_order(monkeypatch, 100)
+    response = client.post('/new-order', json=ORDER)
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert len(calls) == app.config['TX_RETRY_ATTEMPTS']
+    assert transaction_stats(client) == {'retries': app.config['TX_RETRY_ATTEMPTS'] - 1, 'aborts': 1}
+    assert client.get('/stock?ids=1').json['items'] == [{'id': 1, 'quantity': 10}]
+
+
+def test_running_out_of_budget_answers_503(app, client, monkeypatch, sleeps):
+    seed(app)
+    app.config.update(TX_RETRY_ATTEMPTS=100, TX_RETRY_BASE_DELAY=0.1, TX_RETRY_MAX_DELAY=0.1, TX_RETRY_BUDGET=0.25)
+    monkeypatch.setattr(app_module.random, 'uniform', lambda low, high: high)
+    calls = failing_place_order(monkeypatch, 100)
+    response = client.post('/new-order', json=ORDER)
+    assert response.status_code == 503
+    # Two 0.1 s waits fit in the budget; a third would not.
+    assert sleeps == [0.1, 0.1]
+    assert len(calls) == 3
+    assert transaction_stats(client) == {'retries': 2, 'aborts': 1}
+
+
+def test_other_database_errors_are_not_retried(app, client, monkeypatch, sleeps):
+    seed(app)
+    calls = failing_place_order(
+        monkeypatch, 1, lambda: OperationalError('SELECT ...', {}, sqlite3.OperationalError('no such table'))
+    )
+    assert client.post('/new-order', json=ORDER).status_code == 500
+    assert len(calls) == 1
+    assert sleeps == []
+    assert transaction_stats(client) == {'retries': 0, 'aborts': 0}
+
+
+def test_a_locked_sqlite_database_is_retried(tmp_path):
+    class FileConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "shop.db"}'
+        SQLALCHEMY_ENGINE_OPTIONS = {'connect_args': {'timeout': 0.01}}
+        # Enough attempts to outlast the lock whatever delays the jitter picks.
+        TX_RETRY_ATTEMPTS = 50
+        TX_RETRY_MAX_DELAY = 0.05
+
+    app = create_app(FileConfig)
+    seed(app)
+    client = app.test_client()
+    client.get('/products/1')
+    lock_taken = threading.Event()
+
+    def hold_write_lock(seconds):
+        connection = sqlite3.connect(tmp_path / 'shop.db', isolation_level=None)
+        connection.execute('BEGIN IMMEDIATE')
+        lock_taken.set()
+        time.sleep(seconds)
+        connection.execute('ROLLBACK')
+        connection.close()
+
+    writer = threading.Thread(target=hold_write_lock, args=(0.1,))
+    writer.start()
+    lock_taken.wait()
+    response = client.post('/new-order', json=ORDER)
+    writer.join()
+    assert response.status_code == 201
+    stats = transaction_stats(client)
+    assert stats['retries'] >= 1 and stats['aborts'] == 0
+    with app.app_context():
+        db.engine.dispose()
@@ -0,0 +1,65 @@
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from app import (
+    Order, OrderProduct, OrderSchema, Product, ProductSchema, User, UserSchema,
+    attach_order_lines, compiled_schema, db, serialized_columns,
+)
+
+
+@pytest.fixture
+def catalog(app):
+    with app.app_context():
+        db.session.add_all([
+            User(name='Ada', email='ada@example.com', phone='555'),
+            User(name='Bob', email=None, phone=None),
+            Product(name='Laptop', price=999.99, quantity=10),
+            Product(name='Mouse', price=20, quantity=0),
+        ])
+        db.session.flush()
+        db.session.add_all([
+            Order(date=datetime(2024, 12, 18, 10, 30), user_id=1, total_price=1019.99),
+            Order(date=datetime(2024, 12, 19), user_id=None, total_price=0),
+        ])
+        db.session.flush()
+        db.session.add_all([
+            OrderProduct(order_id=1, product_id=1, quantity=1),
+            OrderProduct(order_id=1, product_id=2, quantity=1),
+        ])
+        db.session.commit()
+    with app.app_context():
+        yield
+
+
+def assert_identical(schema_class, objects, only=None):
+    schema, dump = compiled_schema(schema_class, True, only)
+    assert json.dumps(dump(objects)) == json.dumps(schema.dump(objects))
+
+
+@pytest.mark.parametrize('schema_class, model, only', [
+    (UserSchema, User, None),
+    (UserSchema, User, ('id', 'email')),
+    (ProductSchema, Product, None),
+    (ProductSchema, Product, ('name', 'price')),
+    (OrderSchema, Order, None),
+    (OrderSchema, Order, ('id', 'user_id')),
+])
+def test_compiled_dump_matches_marshmallow_for_orm_objects(catalog, schema_class, model, only):
+    assert_identical(schema_class, model.query.order_by(model.id).all(), only)
+
+
+@pytest.mark.parametrize('schema_class, model', [(UserSchema, User), (ProductSchema, Product)])
+def test_compiled_dump_matches_marshmallow_for_rows(catalog, schema_class, model):
+    schema, _ = compiled_schema(schema_class, True)
+    rows = db.session.execute(select(*serialized_columns(model, schema)).order_by(model.id)).all()
+    assert_identical(schema_class, rows)
+
+
+@pytest.mark.parametrize('only', [None, ('id', 'order_products')])
+def test_compiled_dump_matches_marshmallow_for_order_rows(catalog, only):
+    schema, _ = compiled_schema(OrderSchema, True, only)
+    rows = db.session.execute(select(*serialized_columns(Order, schema)).order_by(Order.id)).all()
+    assert_identical(OrderSchema, attach_order_lines(rows), only)